@@ -1,20 +1,45 @@
 import os
+import io
 import json
+import time
 import datetime
+import bisect
+import atexit
+import contextlib
+import functools
 import re
+import sqlite3
 import sys
+import threading
+import queue
 try:
     import speech_recognition as sr
 except ImportError:
     sr = None  # Speech recognition is optional for testing
 
 TASKS_FILE = 'tasks.json'
+SQLITE_TASKS_FILE = 'tasks.db'
 PRIORITIES = ['low', 'medium', 'high']
+JOURNAL_SUFFIX = '.journal'
+COMPACT_THRESHOLD = 1000  # journal records before the snapshot is rewritten
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+SNAPSHOT_HEADER = re.compile(r'\{"seq": (\d+), "tasks": \[$')
+SNAPSHOT_CHUNK_SIZE = 1 << 20  # bytes of snapshot parsed per json.loads call
+PAGE_SIZE = 20
+PARSE_CACHE_SIZE = 1024
+WRITE_BEHIND_DELAY = 0.5  # seconds without changes before a background flush
+# Sort rank for "sorted by priority": high first
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
 
 
 def parse_natural_date(text):
-    today = datetime.date.today()
-    text = text.lower().strip()
+    # Results are cached per calendar day, so relative dates roll over at
+    # midnight
+    return _parse_natural_date(text.lower().strip(), datetime.date.today())
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_natural_date(text, today):
     if text == 'today':
         return today
     elif text == 'tomorrow':
@@ -31,94 +56,1029 @@ def parse_natural_date(text):
             raise ValueError(f"Invalid date: {text}")
 
 
-class TaskManager:
-    def __init__(self, filename=TASKS_FILE):
+LIST_PATTERN = (r'list(?: tasks)?(?: (all|pending|completed|done))?(?: tasks)?'
+                r'(?: (low|medium|high) priority)?(?: tasks)?'
+                r'(?: (overdue)| due (.+?))?'
+                r'(?: sorted by (priority|due date|due))?(?: page (\d+))?$')
+
+
+def parse_list_filters(status, priority, overdue, due_str, sort, page):
+    # Turns the groups of LIST_PATTERN into TaskManager.find_tasks arguments
+    filters = {}
+    today = datetime.date.today()
+    if status in ('pending', 'completed', 'done'):
+        filters['completed'] = status != 'pending'
+    if priority:
+        filters['priority'] = priority
+    if overdue:
+        filters['completed'] = False
+        filters['due_to'] = today - datetime.timedelta(days=1)
+    elif due_str == 'this week':
+        filters['due_from'] = today
+        filters['due_to'] = today + datetime.timedelta(days=6 - today.weekday())
+    elif due_str and due_str.startswith('before '):
+        filters['due_to'] = parse_natural_date(due_str[len('before '):]) - datetime.timedelta(days=1)
+    elif due_str and due_str.startswith('after '):
+        filters['due_from'] = parse_natural_date(due_str[len('after '):]) + datetime.timedelta(days=1)
+    elif due_str:
+        filters['due_from'] = filters['due_to'] = parse_natural_date(due_str)
+    if sort:
+        filters['sort'] = 'priority' if sort == 'priority' else 'due'
+    if page:
+        filters['limit'] = PAGE_SIZE
+        filters['offset'] = (max(int(page), 1) - 1) * PAGE_SIZE
+    return filters
+
+
+def print_task(idx, task):
+    status = '✓' if task.completed else '✗'
+    due = task.due_date if task.due else 'No due date'
+    print(f"{idx}. [{status}] {task.description} (Priority: {task.priority}, Due: {due})")
+
+
+# Every task shares these string objects instead of holding its own copy
+INTERNED_PRIORITIES = {priority: sys.intern(priority) for priority in PRIORITIES}
+
+
+@functools.lru_cache(maxsize=4096)
+def iso_to_ordinal(text):
+    # Cached so tasks due on the same day share one int and one parse
+    return datetime.date.fromisoformat(text).toordinal()
+
+
+class Task:
+    """A task stored compactly: no per-instance dict, a shared priority
+    string and the due date as a ``date.toordinal()`` int (None if unset).
+
+    Instances are treated as immutable; use ``replace`` to change one.
+    """
+
+    __slots__ = ('description', 'priority', 'due', 'completed')
+
+    def __init__(self, description, priority='medium', due=None, completed=False):
+        self.description = description
+        # Priorities outside PRIORITIES (hand-edited files) are kept as-is
+        self.priority = INTERNED_PRIORITIES.get(priority) or sys.intern(priority)
+        self.due = due
+        self.completed = completed
+
+    @property
+    def due_date(self):
+        return datetime.date.fromordinal(self.due).isoformat() if self.due else None
+
+    @classmethod
+    def from_dict(cls, data):
+        due_date = data['due_date']
+        return cls(data['description'], data['priority'],
+                   iso_to_ordinal(due_date) if due_date else None, bool(data['completed']))
+
+    def to_dict(self):
+        return {
+            'description': self.description,
+            'priority': self.priority,
+            'due_date': self.due_date,
+            'completed': self.completed
+        }
+
+    def replace(self, **changes):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return Task(**fields)
+
+    def __repr__(self):
+        return (f"Task({self.description!r}, {self.priority!r}, due={self.due_date!r}, "
+                f"completed={self.completed!r})")
+
+
+class TaskStorage:
+    """Persistence backend for TaskManager.
+
+    ``load`` returns the task list (Tasks in task-number order) that the
+    backend keeps a reference to. ``add``, ``update`` and ``delete`` apply a
+    change to that list and persist it together, so background writers never
+    see one without the other; TaskManager only reads the list. Backends
+    that can answer filtered queries themselves set ``supports_query`` and
+    implement ``query``; otherwise TaskManager filters the in-memory list.
+
+    While ``deferred`` is set, changes may be held back until ``flush``.
+    A backend whose ``load`` failed records the error in ``load_error`` and
+    refuses to touch the file afterwards.
+    """
+
+    supports_query = False
+    deferred = False
+    load_error = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def add(self, task):
+        raise NotImplementedError
+
+    def update(self, index, task):
+        raise NotImplementedError
+
+    def delete(self, index):
+        raise NotImplementedError
+
+    def query(self, priority=None, completed=None, due_from=None, due_to=None,
+              sort=None, limit=None, offset=0):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def compact(self, background=True):
+        pass
+
+    def close(self):
+        pass
+
+    def _check_writable(self):
+        if self.load_error is not None:
+            raise RuntimeError(f"{self.filename} could not be loaded ({self.load_error}); "
+                               "not writing to it")
+
+
+class JournalTaskStorage(TaskStorage):
+    """Snapshot file plus an append-only journal of task operations.
+
+    Each mutation appends one fsynced line to ``<filename>.journal``. Once the
+    journal holds ``compact_threshold`` records, the full task list is written
+    to a new snapshot in a background thread and atomically renamed over
+    ``<filename>``. Loading reads the snapshot and replays the journal tail;
+    every record carries a sequence number, so records already folded into
+    the snapshot are skipped. If loading fails, every later write raises
+    instead, so the empty list left behind can never be compacted over the
+    file that could not be read.
+    """
+
+    def __init__(self, filename=TASKS_FILE, compact_threshold=COMPACT_THRESHOLD):
         self.filename = filename
+        self.journal_filename = filename + JOURNAL_SUFFIX
+        self.rotated_filename = self.journal_filename + '.old'
+        self.compact_threshold = compact_threshold
         self.tasks = []
-        self.load_tasks()
+        self.seq = 0
+        self._journal = None
+        self._journal_records = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def load(self):
+        try:
+            self.tasks, self.seq = self._read_snapshot()
+            interrupted = os.path.exists(self.rotated_filename)
+            # The rotated journal only survives a compaction that did not finish
+            for path in (self.rotated_filename, self.journal_filename):
+                self._journal_records += self._replay(path)
+        except Exception as e:
+            self.load_error = e
+            raise
+        self.load_error = None
+        if interrupted:
+            self.compact(background=False)
+        return self.tasks
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.filename):
+            return [], 0
+        with open(self.filename, 'r') as f:
+            header = SNAPSHOT_HEADER.match(f.readline())
+            if header is None:
+                # Plain lists are task files written before the journal
+                # existed (or files edited by hand): parse them whole
+                f.seek(0)
+                data = json.load(f)
+                if isinstance(data, list):
+                    return [Task.from_dict(task) for task in data], 0
+                return [Task.from_dict(task) for task in data['tasks']], data['seq']
+            # Our own snapshots hold one task per line, so they can be parsed
+            # in bounded chunks of whole lines instead of as one document
+            tasks = []
+            while True:
+                lines = f.readlines(SNAPSHOT_CHUNK_SIZE)
+                if not lines:
+                    break
+                chunk = ''.join(lines).rstrip()
+                if chunk.endswith(']}'):
+                    chunk = chunk[:-2].rstrip()
+                chunk = chunk.rstrip(',')
+                if chunk:
+                    tasks.extend(Task.from_dict(task) for task in json.loads('[' + chunk + ']'))
+            return tasks, int(header.group(1))
+
+    def _replay(self, path):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, 'rb+') as f:
+            offset = 0
+            for line_number, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    # Only the final line can lack its newline: a write torn
+                    # by a crash. Drop it so new records do not end up glued
+                    # to it.
+                    print(f"Warning: dropping incomplete record at {path} line {line_number}")
+                    f.truncate(offset)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    # A complete line that does not decode is corruption,
+                    # not a torn write; records after it are still valid
+                    raise ValueError(f"Corrupt record at {path} line {line_number}: {e}") from e
+                offset += len(line)
+                count += 1
+                if record['seq'] <= self.seq:
+                    continue
+                if record['op'] == 'add':
+                    self.tasks.append(Task.from_dict(record['task']))
+                elif record['op'] == 'update':
+                    self.tasks[record['index']] = Task.from_dict(record['task'])
+                elif record['op'] == 'delete':
+                    del self.tasks[record['index']]
+                self.seq = record['seq']
+        return count
+
+    def add(self, task):
+        self._append({'op': 'add', 'task': task.to_dict()}, lambda: self.tasks.append(task))
+
+    def update(self, index, task):
+        self._append({'op': 'update', 'index': index, 'task': task.to_dict()},
+                     lambda: self.tasks.__setitem__(index, task))
 
-    def load_tasks(self):
-        if os.path.exists(self.filename):
+    def delete(self, index):
+        self._append({'op': 'delete', 'index': index}, lambda: self.tasks.__delitem__(index))
+
+    def _append(self, record, apply):
+        self._check_writable()
+        with self._lock:
+            record['seq'] = self.seq + 1
+            line = json.dumps(record) + '\n'
+            if self.deferred:
+                self._pending.append(line)
+            else:
+                # Written ahead of the change: if the write fails, neither
+                # the task list nor the journal is changed, so retrying the
+                # command cannot apply it twice
+                self._write_records(self._pending + [line])
+                self._pending = []
+            apply()
+            self.seq += 1
+            due = self._journal_records >= self.compact_threshold
+        if due:
+            self.compact()
+
+    def flush(self):
+        # Writes every pending record with a single fsync
+        with self._lock:
+            if not self._pending:
+                return
+            self._write_records(self._pending)
+            self._pending = []
+            due = self._journal_records >= self.compact_threshold
+        if due:
+            self.compact()
+
+    def _write_records(self, lines):
+        # Called with the lock held. A failed write is cut back off the
+        # journal, so no half-written record is left for later ones to
+        # follow.
+        if self._journal is None:
+            self._journal = open(self.journal_filename, 'a')
+        size = os.fstat(self._journal.fileno()).st_size
+        try:
+            self._journal.write(''.join(lines))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except Exception:
+            journal, self._journal = self._journal, None
+            with contextlib.suppress(Exception):
+                journal.close()
+            with contextlib.suppress(OSError):
+                os.truncate(self.journal_filename, size)
+            raise
+        self._journal_records += len(lines)
+
+    def compact(self, background=True):
+        # A background request is skipped while a snapshot is being written;
+        # a synchronous one waits for that snapshot, then writes a current one
+        self._check_writable()
+        while True:
+            with self._lock:
+                running = self._compactor
+                if running is None or not running.is_alive():
+                    # Later appends go to a fresh journal; the rotated one is
+                    # kept until the snapshot covering it has been renamed
+                    # into place.
+                    if self._journal is not None:
+                        self._journal.close()
+                        self._journal = None
+                    self._rotate_journal()
+                    self._journal_records = 0
+                    # Tasks are replaced rather than mutated, so a shallow
+                    # copy is a consistent view for the writer thread.
+                    tasks, seq = list(self.tasks), self.seq
+                    compactor = self._compactor = threading.Thread(
+                        target=self._write_snapshot, args=(tasks, seq))
+                    compactor.start()
+                    break
+            if background:
+                return
+            running.join()
+        if not background:
+            compactor.join()
+
+    def _rotate_journal(self):
+        if not os.path.exists(self.journal_filename):
+            return
+        if not os.path.exists(self.rotated_filename):
+            os.replace(self.journal_filename, self.rotated_filename)
+            return
+        # An earlier snapshot failed, so its rotated journal is still needed
+        with open(self.journal_filename, 'r') as src, open(self.rotated_filename, 'a') as dst:
+            dst.write(src.read())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.remove(self.journal_filename)
+
+    def _write_snapshot(self, tasks, seq):
+        tmp_filename = self.filename + '.tmp'
+        try:
+            # One task per line keeps the snapshot valid JSON while letting
+            # it be written (and read) incrementally.
+            with open(tmp_filename, 'w') as f:
+                f.write('{"seq": %d, "tasks": [\n' % seq)
+                f.write(',\n'.join(json.dumps(task.to_dict()) for task in tasks))
+                f.write('\n]}\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, self.filename)
+            if os.path.exists(self.rotated_filename):
+                os.remove(self.rotated_filename)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+class SqliteTaskStorage(TaskStorage):
+    """SQLite table with indexes on priority, due date and completion.
+
+    Task numbers stay positional (1 = oldest task); ``_ids`` maps positions
+    to row ids, which stay sorted because AUTOINCREMENT never reuses them,
+    so mapping a query hit back to its task number is a binary search.
+    The database is opened by ``load``, so a file that is not a SQLite
+    database is reported like any other load error.
+    """
+
+    supports_query = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            due_date TEXT,
+            completed INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority_due ON tasks (priority, due_date);
+        CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_date);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_due ON tasks (completed, due_date);
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.tasks = []
+        self._ids = []
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def _row_to_task(row):
+        return Task(row[1], row[2], iso_to_ordinal(row[3]) if row[3] else None, bool(row[4]))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.filename, check_same_thread=False)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def load(self):
+        with self._lock:
             try:
-                with open(self.filename, 'r') as f:
-                    self.tasks = json.load(f)
+                if self._conn is None:
+                    self._conn = self._connect()
+                rows = self._conn.execute(
+                    'SELECT id, description, priority, due_date, completed FROM tasks ORDER BY id'
+                ).fetchall()
             except Exception as e:
-                print(f"Error loading tasks: {e}")
-                self.tasks = []
+                self.load_error = e
+                raise
+            self.load_error = None
+        self._ids = [row[0] for row in rows]
+        self.tasks = [self._row_to_task(row) for row in rows]
+        return self.tasks
+
+    def add(self, task):
+        self._check_writable()
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO tasks (description, priority, due_date, completed) VALUES (?, ?, ?, ?)',
+                (task.description, task.priority, task.due_date, int(task.completed))
+            )
+            self._ids.append(cursor.lastrowid)
+            self.tasks.append(task)
+            if not self.deferred:
+                self._conn.commit()
+
+    def update(self, index, task):
+        self._check_writable()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE tasks SET description = ?, priority = ?, due_date = ?, completed = ? WHERE id = ?',
+                (task.description, task.priority, task.due_date, int(task.completed),
+                 self._ids[index])
+            )
+            self.tasks[index] = task
+            if not self.deferred:
+                self._conn.commit()
+
+    def delete(self, index):
+        self._check_writable()
+        with self._lock:
+            self._conn.execute('DELETE FROM tasks WHERE id = ?', (self._ids[index],))
+            del self._ids[index]
+            del self.tasks[index]
+            if not self.deferred:
+                self._conn.commit()
+
+    def flush(self):
+        # Commits the open transaction, if deferred writes started one
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+
+    def query(self, priority=None, completed=None, due_from=None, due_to=None,
+              sort=None, limit=None, offset=0):
+        clauses, params = [], []
+        if priority is not None:
+            clauses.append('priority = ?')
+            params.append(priority)
+        if completed is not None:
+            clauses.append('completed = ?')
+            params.append(int(completed))
+        if due_from is not None:
+            clauses.append('due_date >= ?')
+            params.append(due_from.isoformat())
+        if due_to is not None:
+            clauses.append('due_date <= ?')
+            params.append(due_to.isoformat())
+        sql = 'SELECT id, description, priority, due_date, completed FROM tasks'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        if sort == 'priority':
+            sql += (" ORDER BY CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END,"
+                    " due_date IS NULL, due_date, id")
+        elif sort == 'due':
+            sql += ' ORDER BY due_date IS NULL, due_date, id'
         else:
-            self.tasks = []
+            sql += ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(bisect.bisect_left(self._ids, row[0]) + 1, self._row_to_task(row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+def open_storage(filename=None, backend=None):
+    # Backend defaults from the file extension: .db/.sqlite -> SQLite; the
+    # file name defaults from the backend, so the two never share a file
+    if filename is None:
+        filename = SQLITE_TASKS_FILE if backend == 'sqlite' else TASKS_FILE
+    if backend is None:
+        backend = 'sqlite' if filename.endswith(SQLITE_SUFFIXES) else 'json'
+    if backend == 'sqlite':
+        return SqliteTaskStorage(filename)
+    if backend == 'json':
+        return JournalTaskStorage(filename)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def description_words(text):
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+class TaskIndex:
+    """Secondary indexes over a task list, keyed by a stable task id.
+
+    Priority buckets, the set of completed ids, a due-date list kept sorted
+    as ``(due ordinal, id)`` and an inverted word index over descriptions.
+    ``ids`` holds the id of the task at each 0-based position. Ids are
+    handed out in increasing order and deleting keeps the remaining order,
+    so ``ids`` stays sorted and a position is found by binary search (the
+    same scheme SqliteTaskStorage uses for row ids); deleting a task
+    therefore never renumbers the entries of the tasks after it.
+    """
+
+    def __init__(self, tasks=()):
+        self.by_priority = {priority: set() for priority in PRIORITIES}
+        self.completed = set()
+        self.words = {}
+        self.ids = list(range(len(tasks)))
+        self.next_id = len(tasks)
+        for task_id, task in enumerate(tasks):
+            self._insert(task_id, task)
+        # One sort for the initial build; insort is only for later changes
+        self.due = sorted((task.due, task_id) for task_id, task in enumerate(tasks)
+                          if task.due is not None)
+
+    def add(self, task):
+        # Indexes a task appended to the end of the list
+        task_id = self.next_id
+        self.next_id += 1
+        self.ids.append(task_id)
+        self._insert(task_id, task)
+        if task.due is not None:
+            bisect.insort(self.due, (task.due, task_id))
+
+    def update(self, position, old_task, new_task):
+        task_id = self.ids[position]
+        self._remove(task_id, old_task)
+        self._insert(task_id, new_task)
+        if new_task.due is not None:
+            bisect.insort(self.due, (new_task.due, task_id))
+
+    def delete(self, position, task):
+        self._remove(self.ids.pop(position), task)
+
+    def _insert(self, task_id, task):
+        # Everything but the due list; hand-edited files may hold
+        # priorities outside PRIORITIES
+        self.by_priority.setdefault(task.priority, set()).add(task_id)
+        if task.completed:
+            self.completed.add(task_id)
+        for word in description_words(task.description):
+            self.words.setdefault(word, set()).add(task_id)
+
+    def _remove(self, task_id, task):
+        self.by_priority.get(task.priority, set()).discard(task_id)
+        self.completed.discard(task_id)
+        if task.due is not None:
+            i = bisect.bisect_left(self.due, (task.due, task_id))
+            if i < len(self.due) and self.due[i] == (task.due, task_id):
+                del self.due[i]
+        for word in description_words(task.description):
+            task_ids = self.words.get(word)
+            if task_ids is not None:
+                task_ids.discard(task_id)
+                if not task_ids:
+                    del self.words[word]
+
+    def lookup(self, priority=None, completed=None, due_from=None, due_to=None, text=None):
+        # Returns the sorted positions of matching tasks, or None when no
+        # filter narrows the candidates (callers then walk the list)
+        candidates = []
+        if priority is not None:
+            candidates.append(self.by_priority.get(priority, set()))
+        if due_from is not None or due_to is not None:
+            lo = 0 if due_from is None else bisect.bisect_left(self.due, (due_from.toordinal(),))
+            hi = len(self.due) if due_to is None else bisect.bisect_right(self.due, (due_to.toordinal(), float('inf')))
+            candidates.append({task_id for _, task_id in self.due[lo:hi]})
+        if text is not None:
+            words = description_words(text)
+            if not words:
+                # Nothing searchable in the text, so nothing can match it
+                return []
+            for word in words:
+                candidates.append(self.words.get(word, set()))
+        if completed:
+            candidates.append(self.completed)
+        if not candidates:
+            return None
+        # Intersect smallest first so the work is bounded by the most
+        # selective filter
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for other in candidates[1:]:
+            matches &= other
+            if not matches:
+                break
+        if completed is False:
+            matches -= self.completed
+        # Ids sort in the same order as the positions they map to
+        return [bisect.bisect_left(self.ids, task_id) for task_id in sorted(matches)]
+
+
+def _sort_key(sort):
+    if sort == 'priority':
+        return lambda item: (PRIORITY_RANK.get(item[1].priority, len(PRIORITY_RANK)), item[1].due is None, item[1].due or 0, item[0])
+    return lambda item: (item[1].due is None, item[1].due or 0, item[0])
+
+
+class CommandGrammar:
+    """Dispatch table from a command's first word to its pattern and handler.
+
+    Patterns are compiled once at registration. ``parse`` is memoized, so
+    repeated phrases (common in scripted input) skip the regex entirely.
+    Handlers receive the pattern's groups and return True on success.
+    """
+
+    def __init__(self):
+        self.verbs = {}
+        self.parse = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
+
+    def register(self, verb, pattern, usage):
+        def decorator(handler):
+            self.verbs[verb] = (re.compile(pattern), handler, usage)
+            self.parse.cache_clear()
+            return handler
+        return decorator
+
+    def _parse(self, command):
+        # Returns (handler, groups), (None, usage) when the verb is known but
+        # the rest does not parse, or (None, None) for an unknown verb
+        entry = self.verbs.get(command.split(' ', 1)[0])
+        if entry is None:
+            return None, None
+        pattern, handler, usage = entry
+        m = pattern.match(command)
+        if not m:
+            return None, usage
+        return handler, m.groups()
+
+    def usage(self):
+        verbs = list(self.verbs)
+        return ', '.join(verbs[:-1]) + ', or ' + verbs[-1] if len(verbs) > 1 else ''.join(verbs)
+
+    def help(self):
+        # Built from the registered usage strings, so new verbs show up
+        usages = [usage for _, _, usage in self.verbs.values()]
+        return "Commands: " + ", ".join(usages) + ", or 'exit'"
+
+
+COMMANDS = CommandGrammar()
+
+
+class WriteBehindFlusher:
+    """Flushes a deferred storage from a background thread.
+
+    Mutations only mark the storage dirty; the worker flushes once no new
+    change has arrived for ``delay`` seconds (or ``max_delay`` after the
+    first unflushed change, so a steady stream of edits still gets
+    written). ``close`` flushes synchronously and is also registered with
+    atexit.
+    """
+
+    def __init__(self, storage, delay=WRITE_BEHIND_DELAY, max_delay=None):
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else delay * 10
+        self.storage.deferred = True
+        self._dirty = threading.Event()
+        self._wake = threading.Event()
+        self._first_change = self._last_change = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self):
+        now = time.monotonic()
+        if not self._dirty.is_set():
+            self._first_change = now
+        self._last_change = now
+        self._dirty.set()
+
+    def _run(self):
+        while True:
+            self._dirty.wait()
+            if self._closed:
+                return
+            while not self._closed:
+                deadline = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wake.wait(remaining)
+            if self._closed:
+                return
+            self._dirty.clear()
+            try:
+                self.storage.flush()
+            except Exception as e:
+                print(f"Error saving tasks: {e}")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._dirty.set()
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.storage.flush()
+
+
+class TaskManager:
+    def __init__(self, filename=TASKS_FILE, storage=None, write_behind=None, lazy=False):
+        # write_behind: debounce window in seconds for background flushing;
+        # None writes every change through synchronously.
+        # lazy: load tasks on a background thread; the first access to
+        # self.tasks waits for it, so the CLI can prompt straight away.
+        self.filename = filename
+        self.storage = storage if storage is not None else open_storage(filename)
+        self._tasks = []
+        self._loaded = threading.Event()
+        self._index = None
+        self._flusher = None
+        self._closed = False
+        self.load_tasks(background=lazy)
+        if write_behind:
+            self._flusher = WriteBehindFlusher(self.storage, write_behind)
+
+    @property
+    def tasks(self):
+        if not self._loaded.is_set():
+            self._loaded.wait()
+        return self._tasks
+
+    def load_tasks(self, background=False):
+        self._index = None
+        self._loaded.clear()
+        if background:
+            threading.Thread(target=self._load, daemon=True).start()
+        else:
+            self._load()
+
+    def _load(self):
+        try:
+            self._tasks = self.storage.load()
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            self.storage.tasks = self._tasks = []
+        finally:
+            self._loaded.set()
 
     def save_tasks(self):
+        # Writes out deferred changes, then folds the journal into a fresh
+        # snapshot right away
+        self._loaded.wait()
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            self.storage.flush()
+            self.storage.compact(background=False)
         except Exception as e:
             print(f"Error saving tasks: {e}")
 
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._loaded.wait()
+        try:
+            if self._flusher is not None:
+                self._flusher.close()
+        finally:
+            self.storage.close()
+
+    def find_tasks(self, priority=None, completed=None, due_from=None, due_to=None,
+                   sort=None, limit=None, offset=0, text=None):
+        """Returns ``(task number, task)`` pairs matching every given filter.
+
+        ``due_from``/``due_to`` are inclusive dates; ``text`` matches tasks
+        whose description contains every word in it; ``sort`` is ``None``
+        (task number), ``'priority'`` or ``'due'``.
+        """
+        self._loaded.wait()
+        if self.storage.supports_query and text is None:
+            return self.storage.query(priority, completed, due_from, due_to, sort, limit, offset)
+        index = self.get_index()
+        positions = index.lookup(priority, completed, due_from, due_to, text)
+        if positions is None:
+            positions = range(len(self.tasks))
+            if completed is False:
+                positions = [position for position in positions if not self.tasks[position].completed]
+        matches = [(position + 1, self.tasks[position]) for position in positions]
+        if sort is not None:
+            matches.sort(key=_sort_key(sort))
+        if limit is not None:
+            matches = matches[offset:offset + limit]
+        return matches
+
+    def get_index(self):
+        # Built on first use rather than at load time, so startup does not
+        # pay for it
+        if self._index is None:
+            self._index = TaskIndex(self.tasks)
+        return self._index
+
     def add_task(self, description, priority='medium', due_date=None):
         if priority not in PRIORITIES:
             raise ValueError(f"Invalid priority: {priority}")
-        task = {
-            'description': description,
-            'priority': priority,
-            'due_date': due_date.isoformat() if due_date else None,
-            'completed': False
-        }
-        self.tasks.append(task)
-        self.save_tasks()
+        task = Task(description, priority, due_date.toordinal() if due_date else None)
+        self._loaded.wait()
+        try:
+            self.storage.add(task)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            self._index = None
+            return False
+        if self._index is not None:
+            self._index.add(task)
+        self._changed()
         print(f"Task added: {description} (Priority: {priority}, Due: {due_date})")
+        return True
 
-    def list_tasks(self):
+    def list_tasks(self, **filters):
         if not self.tasks:
             print("No tasks found.")
             return
-        for idx, task in enumerate(self.tasks, 1):
-            status = '✓' if task['completed'] else '✗'
-            due = task['due_date'] if task['due_date'] else 'No due date'
-            print(f"{idx}. [{status}] {task['description']} (Priority: {task['priority']}, Due: {due})")
+        if not filters:
+            for idx, task in enumerate(self.tasks, 1):
+                print_task(idx, task)
+            return
+        matches = self.find_tasks(**filters)
+        if not matches:
+            print("No matching tasks.")
+            return
+        for idx, task in matches:
+            print_task(idx, task)
 
     def complete_task(self, index):
+        if not self._check_index(index):
+            return False
+        if not self._replace_task(index, self.tasks[index - 1].replace(completed=True)):
+            return False
+        print(f"Task {index} marked as completed.")
+        return True
+
+    def delete_task(self, index):
+        if not self._check_index(index):
+            return False
+        task = self.tasks[index - 1]
+        try:
+            self.storage.delete(index - 1)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            self._index = None
+            return False
+        if self._index is not None:
+            self._index.delete(index - 1, task)
+        self._changed()
+        print(f"Task {index} deleted: {task.description}")
+        return True
+
+    def edit_task(self, index, description=None, priority=None):
+        if not self._check_index(index):
+            return False
+        if priority is not None and priority not in PRIORITIES:
+            raise ValueError(f"Invalid priority: {priority}")
+        task = self.tasks[index - 1]
+        if description is not None:
+            task = task.replace(description=description)
+        if priority is not None:
+            task = task.replace(priority=priority)
+        if not self._replace_task(index, task):
+            return False
+        print(f"Task {index} updated: {task.description} (Priority: {task.priority})")
+        return True
+
+    def _check_index(self, index):
         if index < 1 or index > len(self.tasks):
             print(f"Invalid task number: {index}")
-            return
-        self.tasks[index - 1]['completed'] = True
-        self.save_tasks()
-        print(f"Task {index} marked as completed.")
+            return False
+        return True
+
+    def _replace_task(self, index, task):
+        # Replace rather than mutate so snapshots taken for compaction stay
+        # consistent
+        old_task = self.tasks[index - 1]
+        try:
+            self.storage.update(index - 1, task)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            self._index = None
+            return False
+        if self._index is not None:
+            self._index.update(index - 1, old_task, task)
+        self._changed()
+        return True
+
+    def _changed(self):
+        if self._flusher is not None:
+            self._flusher.mark_dirty()
+
+    @contextlib.contextmanager
+    def batch(self):
+        # Holds storage writes back until the block ends, then flushes them
+        # together: one journal fsync or one SQLite commit. A failed flush
+        # raises, so callers can tell the batch was not saved.
+        previous = self.storage.deferred
+        self.storage.deferred = True
+        try:
+            yield self
+        finally:
+            self.storage.deferred = previous
+            self.storage.flush()
 
     def process_command(self, command):
         command = command.lower().strip()
-        if command.startswith('add '):
-            # Example: add submit report with high priority due tomorrow
-            m = re.match(r'add (.+?)(?: with (low|medium|high) priority)?(?: due (.+))?$', command)
-            if not m:
-                print("Could not parse add command. Try: 'add <task> with <priority> priority due <date>'")
-                return
-            desc = m.group(1)
-            priority = m.group(2) if m.group(2) else 'medium'
-            due_str = m.group(3)
-            due_date = None
-            if due_str:
-                try:
-                    due_date = parse_natural_date(due_str)
-                except Exception as e:
-                    print(f"Error parsing date: {e}")
-                    return
+        handler, parsed = COMMANDS.parse(command)
+        if handler is not None:
+            return handler(self, *parsed)
+        if parsed is not None:
+            verb = command.split(' ', 1)[0]
+            print(f"Could not parse {verb} command. Try: '{parsed}'")
+        else:
+            print(f"Unknown command. Try: {COMMANDS.usage()}.")
+        return False
+
+    @COMMANDS.register('add', r'add (.+?)(?: with (low|medium|high) priority)?(?: due (.+))?$',
+                       'add <task> with <priority> priority due <date>')
+    def _command_add(self, desc, priority, due_str):
+        # Example: add submit report with high priority due tomorrow
+        priority = priority if priority else 'medium'
+        due_date = None
+        if due_str:
             try:
-                self.add_task(desc, priority, due_date)
+                due_date = parse_natural_date(due_str)
             except Exception as e:
-                print(f"Error adding task: {e}")
-        elif command.startswith('list'):
-            self.list_tasks()
-        elif command.startswith('complete '):
-            # Example: complete 2
-            m = re.match(r'complete (\d+)', command)
-            if not m:
-                print("Could not parse complete command. Try: 'complete <task number>'")
-                return
-            idx = int(m.group(1))
-            self.complete_task(idx)
-        else:
-            print("Unknown command. Try: add, list, or complete.")
+                print(f"Error parsing date: {e}")
+                return False
+        try:
+            return self.add_task(desc, priority, due_date)
+        except Exception as e:
+            print(f"Error adding task: {e}")
+            return False
+
+    @COMMANDS.register('list', LIST_PATTERN,
+                       'list [pending|completed] [<priority> priority] '
+                       '[due <date>|due before <date>|due after <date>|due this week|overdue] '
+                       '[sorted by priority|due date] [page <n>]')
+    def _command_list(self, *groups):
+        # Example: list pending high priority due this week sorted by due date page 2
+        try:
+            filters = parse_list_filters(*groups)
+        except Exception as e:
+            print(f"Error parsing date: {e}")
+            return False
+        self.list_tasks(**filters)
+        return True
+
+    @COMMANDS.register('complete', r'complete (\d+)', 'complete <task number>')
+    def _command_complete(self, idx):
+        # Example: complete 2
+        return self.complete_task(int(idx))
+
+    @COMMANDS.register('delete', r'delete (?:task )?(\d+)$', 'delete <task number>')
+    def _command_delete(self, idx):
+        return self.delete_task(int(idx))
+
+    @COMMANDS.register('edit', r'edit (?:task )?(\d+) (?:to )?(.+)$', 'edit <task number> to <new description>')
+    def _command_edit(self, idx, desc):
+        return self.edit_task(int(idx), description=desc)
+
+    @COMMANDS.register('reprioritize', r'reprioritize (?:task )?(\d+) (?:to )?(low|medium|high)(?: priority)?$',
+                       'reprioritize <task number> to <priority>')
+    def _command_reprioritize(self, idx, priority):
+        return self.edit_task(int(idx), priority=priority)
+
+    @COMMANDS.register('search', r'search (?:for )?(.+)$', 'search <words>')
+    def _command_search(self, text):
+        matches = self.find_tasks(text=text)
+        if not matches:
+            print("No matching tasks.")
+        for idx, task in matches:
+            print_task(idx, task)
+        return True
 
 
 def recognize_voice():
@@ -141,10 +1101,257 @@ def recognize_voice():
         return ''
 
 
-def main():
-    tm = TaskManager()
+class SpeechBackend:
+    """Turns one captured utterance into text; raises on failure."""
+
+    name = None
+
+    def transcribe(self, audio):
+        raise NotImplementedError
+
+
+class GoogleSpeechBackend(SpeechBackend):
+    name = 'google'
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio):
+        return self.recognizer.recognize_google(audio)
+
+
+class SphinxSpeechBackend(SpeechBackend):
+    # Offline recognition; needs the pocketsphinx package
+    name = 'sphinx'
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio):
+        return self.recognizer.recognize_sphinx(audio)
+
+
+class StubSpeechBackend(SpeechBackend):
+    # For testing: the "audio" coming from ScriptedAudioSource is already text
+    name = 'stub'
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def transcribe(self, audio):
+        if self.delay:
+            time.sleep(self.delay)
+        return str(audio)
+
+
+SPEECH_BACKENDS = {backend.name: backend
+                   for backend in (GoogleSpeechBackend, SphinxSpeechBackend, StubSpeechBackend)}
+
+
+class MicrophoneSource:
+    # Captures utterances continuously on speech_recognition's background
+    # listener thread
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone()
+        self._stop_listening = None
+
+    def start(self, callback):
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source)
+        self._stop_listening = self.recognizer.listen_in_background(
+            self.microphone, lambda recognizer, audio: callback(audio))
+
+    def stop(self):
+        if self._stop_listening is not None:
+            self._stop_listening(wait_for_stop=False)
+            self._stop_listening = None
+
+
+class ScriptedAudioSource:
+    # Feeds fixed phrases in place of the microphone, then signals the end
+    # of input with None
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self._thread = None
+
+    def start(self, callback):
+        def feed():
+            for phrase in self.phrases:
+                callback(phrase)
+            callback(None)
+        self._thread = threading.Thread(target=feed, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        pass
+
+
+class VoicePipeline:
+    """Capture, recognition and execution running as separate stages.
+
+    The source pushes utterances onto ``audio`` from its own thread, a
+    recognition worker transcribes them onto ``commands``, and the caller
+    executes commands from that queue, so the microphone keeps listening
+    while earlier commands are still being recognized or run. A ``None``
+    on either queue marks the end of input.
+    """
+
+    def __init__(self, source, backend):
+        self.source = source
+        self.backend = backend
+        self.audio = queue.Queue()
+        self.commands = queue.Queue()
+        self._worker = threading.Thread(target=self._recognize, daemon=True)
+
+    def start(self):
+        self._worker.start()
+        self.source.start(self.audio.put)
+        return self
+
+    def stop(self):
+        self.source.stop()
+        self.audio.put(None)
+
+    def _recognize(self):
+        while True:
+            audio = self.audio.get()
+            if audio is None:
+                self.commands.put(None)
+                return
+            try:
+                text = self.backend.transcribe(audio)
+            except Exception as e:
+                if sr is not None and isinstance(e, sr.UnknownValueError):
+                    print("Could not understand audio.")
+                elif sr is not None and isinstance(e, sr.RequestError):
+                    print(f"Could not request results; {e}")
+                else:
+                    print(f"Recognition error: {e}")
+                continue
+            if text:
+                self.commands.put(text)
+
+
+def run_pipeline(tm, pipeline):
+    print("Voice Task Manager CLI (pipelined recognition)")
+    print(COMMANDS.help())
+    print("Listening... say 'exit' to stop.")
+    pipeline.start()
+    try:
+        while True:
+            command = pipeline.commands.get()
+            if command is None:
+                break
+            print(f"You said: {command}")
+            if command.lower() in ['exit', 'quit']:
+                print("Goodbye!")
+                break
+            tm.process_command(command)
+    except KeyboardInterrupt:
+        print("\nExiting.")
+    finally:
+        pipeline.stop()
+
+
+def run_script(tm, stream, quiet=False):
+    # Runs one command per line (blank lines and '#' comments are skipped)
+    # in a single batch and prints a summary; returns the failure count
+    succeeded = 0
+    failures = []
+    save_error = None
+    start = time.perf_counter()
+    try:
+        with tm.batch():
+            for line_number, line in enumerate(stream, 1):
+                command = line.strip()
+                if not command or command.startswith('#'):
+                    continue
+                if command.lower() in ['exit', 'quit']:
+                    break
+                if quiet:
+                    with contextlib.redirect_stdout(io.StringIO()) as output:
+                        ok = tm.process_command(command)
+                else:
+                    ok = tm.process_command(command)
+                if ok:
+                    succeeded += 1
+                else:
+                    failures.append((line_number, command, output.getvalue().strip() if quiet else ''))
+    except (OSError, sqlite3.Error) as e:
+        save_error = e
+    elapsed = time.perf_counter() - start
+    print(f"Processed {succeeded + len(failures)} commands in {elapsed:.2f}s: "
+          f"{succeeded} succeeded, {len(failures)} failed. {len(tm.tasks)} tasks in total.")
+    for line_number, command, message in failures[:10]:
+        print(f"  line {line_number}: {command}" + (f" -> {message}" if message else ''))
+    if len(failures) > 10:
+        print(f"  ... and {len(failures) - 10} more")
+    if save_error is not None:
+        print(f"Error saving tasks: {save_error}")
+        return len(failures) + 1
+    return len(failures)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Voice Task Manager CLI")
+    parser.add_argument('--file',
+                        help=f"task file; .db/.sqlite files use the SQLite backend "
+                             f"(default: {TASKS_FILE}, or {SQLITE_TASKS_FILE} with --backend sqlite)")
+    parser.add_argument('--backend', choices=['json', 'sqlite'],
+                        help="storage backend (default: chosen from the file extension)")
+    parser.add_argument('--script', metavar='PATH',
+                        help="run the commands in PATH ('-' for stdin) as one batch and exit")
+    parser.add_argument('--quiet', action='store_true',
+                        help="with --script, print only the summary and failed commands")
+    parser.add_argument('--write-behind', type=float, default=WRITE_BEHIND_DELAY, metavar='SECONDS',
+                        help="in interactive modes, save in the background once changes have been quiet "
+                             "this long; 0 saves every change immediately (default: %(default)s)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="keep capturing speech in the background while commands run")
+    parser.add_argument('--recognizer', choices=sorted(SPEECH_BACKENDS), default='google',
+                        help="speech backend for --pipeline; 'stub' reads --stub-phrases instead of "
+                             "the microphone (default: %(default)s)")
+    parser.add_argument('--stub-phrases', metavar='PATH',
+                        help="with --recognizer stub, the phrases to 'hear', one per line")
+    args = parser.parse_args(argv)
+    if args.pipeline:
+        if args.recognizer == 'stub':
+            if not args.stub_phrases:
+                parser.error("--recognizer stub requires --stub-phrases")
+            with open(args.stub_phrases, 'r') as f:
+                phrases = [line.strip() for line in f if line.strip()]
+            pipeline = VoicePipeline(ScriptedAudioSource(phrases), StubSpeechBackend())
+        elif sr is None:
+            parser.error("--pipeline needs speech_recognition installed (or --recognizer stub)")
+        else:
+            pipeline = VoicePipeline(MicrophoneSource(), SPEECH_BACKENDS[args.recognizer]())
+    # Script mode already writes once at the end of its batch
+    write_behind = None if args.script else args.write_behind
+    storage = open_storage(args.file, args.backend)
+    tm = TaskManager(storage.filename, storage, write_behind, lazy=True)
+    try:
+        if args.script == '-':
+            failed = run_script(tm, sys.stdin, args.quiet)
+        elif args.script:
+            with open(args.script, 'r') as f:
+                failed = run_script(tm, f, args.quiet)
+        elif args.pipeline:
+            run_pipeline(tm, pipeline)
+            failed = 0
+        else:
+            run_cli(tm)
+            failed = 0
+    finally:
+        tm.close()
+    if failed:
+        sys.exit(1)
+
+
+def run_cli(tm):
     print("Voice Task Manager CLI")
-    print("Commands: add <task> with <priority> priority due <date>, list, complete <number>, or 'exit'")
+    print(COMMANDS.help())
     while True:
         if sr is not None:
             print("Speak or type your command (or 'exit'):")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Weather Fetcher Benchmark
+Measures process startup time and per-call latency of weather_fetcher.py
+against a local stub of the Open-Meteo forecast endpoint, so it can run
+offline and without touching the real API's rate limits. Startup is timed
+both as shipped (third-party imports deferred) and with requests and
+tabulate imported eagerly, next to the import cost of each module alone.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import weather_fetcher
+from weather_stub import ForecastStub, forecast_payload
+
+FETCHER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather_fetcher.py")
+
+# Runs weather_fetcher.py as __main__ after importing its third-party
+# dependencies up front, i.e. as it behaved before the imports were deferred
+EAGER_PRELUDE = (
+    "import runpy, requests, tabulate; "
+    f"runpy.run_path({FETCHER_SCRIPT!r}, run_name='__main__')"
+)
+
+# Third-party modules whose import cost is reported on its own
+THIRD_PARTY_MODULES = ("requests", "tabulate")
+
+# Canned response used for the parsing benchmark
+STUB_RESPONSE = json.dumps(forecast_payload(51.5, -0.12)).encode("utf-8")
+
+
+def summarize(samples):
+    """
+    Summarizes timing samples in milliseconds.
+
+    Args:
+        samples (list): Durations in seconds
+
+    Returns:
+        dict: min, median, p95 and max in milliseconds
+    """
+    ordered = sorted(samples)
+    p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+    return {
+        "min": ordered[0] * 1000,
+        "median": statistics.median(ordered) * 1000,
+        "p95": ordered[p95_index] * 1000,
+        "max": ordered[-1] * 1000
+    }
+
+
+def format_summary(label, summary):
+    """Formats one summary line for the report."""
+    return (f"{label:<32} min {summary['min']:8.2f} ms | median {summary['median']:8.2f} ms | "
+            f"p95 {summary['p95']:8.2f} ms | max {summary['max']:8.2f} ms")
+
+
+def bench_startup(endpoint, output_format, runs, eager=False):
+    """
+    Times complete `weather_fetcher.py` process runs against the stub.
+
+    Args:
+        endpoint (str): Stub endpoint URL
+        output_format (str): Value for --format
+        runs (int): Number of process launches
+        eager (bool): Import requests and tabulate before running the script
+
+    Returns:
+        list: Wall-clock durations in seconds
+    """
+    script = ["-c", EAGER_PRELUDE] if eager else [FETCHER_SCRIPT]
+    command = [sys.executable, *script, "--format", output_format, "--endpoint", endpoint]
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        samples.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"weather_fetcher.py failed: {result.stderr.decode(errors='replace')}")
+    return samples
+
+
+def bench_imports(runs):
+    """
+    Times a bare interpreter launch and one launch per third-party import.
+
+    Args:
+        runs (int): Number of launches per variant
+
+    Returns:
+        dict: Median seconds keyed by module name ("" for the bare launch)
+    """
+    medians = {}
+    for module in ("",) + THIRD_PARTY_MODULES:
+        command = [sys.executable, "-c", f"import {module}" if module else "pass"]
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, check=True)
+            samples.append(time.perf_counter() - start)
+        medians[module] = statistics.median(samples)
+    return medians
+
+
+def bench_calls(endpoint, calls):
+    """
+    Times in-process `get_weather_data` calls against the stub.
+
+    Args:
+        endpoint (str): Stub endpoint URL
+        calls (int): Number of calls
+
+    Returns:
+        list: Per-call durations in seconds
+    """
+    samples = []
+    # Status messages are printed on every call; discard them so the
+    # terminal does not dominate the measurement.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            start = time.perf_counter()
+            data = weather_fetcher.get_weather_data(endpoint)
+            samples.append(time.perf_counter() - start)
+            if data is None:
+                raise RuntimeError("get_weather_data returned None against the stub server")
+    return samples
+
+
+def bench_parse(iterations):
+    """
+    Compares parsing a response from `content` (bytes) versus `text`.
+
+    `Response.text` has to work out the body encoding first, which for a
+    JSON body without a charset means running charset detection on every
+    access; parsing `content` lets json.loads handle UTF-8 directly.
+
+    Args:
+        iterations (int): Number of parses per variant
+
+    Returns:
+        tuple: (bytes_seconds, text_seconds) total time per variant
+    """
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = STUB_RESPONSE
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        json.loads(response.content)
+    bytes_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        json.loads(response.text)
+    text_seconds = time.perf_counter() - start
+    return bytes_seconds, text_seconds
+
+
+def main(argv=None):
+    """
+    Runs the startup, latency and parsing benchmarks and prints a report.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark weather_fetcher.py against a local stub server.")
+    parser.add_argument("--runs", type=int, default=10, help="process launches per output format (default: 10)")
+    parser.add_argument("--calls", type=int, default=200, help="in-process get_weather_data calls (default: 200)")
+    parser.add_argument("--parse-iterations", type=int, default=2000,
+                        help="json.loads iterations per variant (default: 2000)")
+    args = parser.parse_args(argv)
+
+    with ForecastStub() as stub:
+        endpoint = stub.url
+        print(f"Stub server listening at {endpoint}\n")
+
+        print("Process startup + fetch (subprocess wall time):")
+        for output_format in weather_fetcher.OUTPUT_FORMATS:
+            for label, eager in (("lazy", False), ("eager", True)):
+                samples = bench_startup(endpoint, output_format, args.runs, eager)
+                print(format_summary(f"  --format {output_format} ({label})", summarize(samples)))
+
+        print("\nIn-process get_weather_data latency:")
+        samples = bench_calls(endpoint, args.calls)
+        print(format_summary(f"  {args.calls} calls", summarize(samples)))
+
+    medians = bench_imports(args.runs)
+    print("\nThird-party import cost (median launch time over a bare interpreter):")
+    print(f"  python -c pass                {medians[''] * 1000:8.2f} ms")
+    for module in THIRD_PARTY_MODULES:
+        print(f"  import {module:<22} +{(medians[module] - medians['']) * 1000:7.2f} ms")
+
+    bytes_seconds, text_seconds = bench_parse(args.parse_iterations)
+    print("\nResponse parsing:")
+    print(f"  json.loads(response.content) {bytes_seconds * 1e6 / args.parse_iterations:8.2f} us/parse")
+    print(f"  json.loads(response.text)    {text_seconds * 1e6 / args.parse_iterations:8.2f} us/parse")
+
+
+if __name__ == "__main__":
+    main()
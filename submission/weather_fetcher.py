@@ -2,13 +2,16 @@
 """
 Weather Data Fetcher Script
 Fetches current weather data for London from Open-Meteo API
-and displays it in a formatted Markdown table.
+and displays it in a formatted Markdown table, or as compact JSON/CSV
+for cron jobs and shell pipelines (--format json|csv).
 """
 
-# Required imports (evaluators will verify)
-import requests
+# Third-party imports: requests and tabulate are imported inside the
+# functions that use them. JSON and CSV runs never load tabulate, and
+# --help or bad arguments load neither; every fetch still needs requests.
+# weather_bench.py compares this against importing both eagerly.
+import contextlib
 import json
-from tabulate import tabulate
 import sys
 
 # Constants for API configuration
@@ -18,6 +21,9 @@ LONGITUDE = -0.1278  # London longitude
 CONNECTION_TIMEOUT = 5  # seconds
 READ_TIMEOUT = 10  # seconds
 
+# Supported output formats for the command line
+OUTPUT_FORMATS = ("markdown", "json", "csv")
+
 # Weather condition mapping
 WEATHER_CONDITIONS = {
     0: "Clear",
@@ -50,31 +56,44 @@ WEATHER_CONDITIONS = {
     99: "Thunderstorm with Heavy Hail"
 }
 
-def get_weather_data():
+def get_weather_data(endpoint=API_ENDPOINT, latitude=LATITUDE, longitude=LONGITUDE):
     """
     Fetches weather data from Open-Meteo API with comprehensive error handling.
     
+    Args:
+        endpoint (str): Forecast endpoint URL (overridable for local testing)
+        latitude (float or str): Latitude, or comma-separated latitudes
+        longitude (float or str): Longitude, or comma-separated longitudes
+        
     Returns:
-        dict: Weather data if successful, None if failed
+        dict: Weather data if successful (a list of dicts when several
+              comma-separated coordinates are requested), None if failed
     """
+    import requests
+    
     # Construct API URL with parameters
     params = {
-        'latitude': LATITUDE,
-        'longitude': LONGITUDE,
+        'latitude': latitude,
+        'longitude': longitude,
         'current_weather': 'true'
     }
     
+    if latitude == LATITUDE and longitude == LONGITUDE:
+        location_name = "London"
+    else:
+        location_name = f"{latitude}, {longitude}"
+    
     # Set up headers with User-Agent
     headers = {
         'User-Agent': 'WeatherFetcher/1.0 (Python Script)'
     }
     
     try:
-        print("Fetching weather data for London...")
+        print(f"Fetching weather data for {location_name}...")
         
         # Make API request with timeout handling
         response = requests.get(
-            API_ENDPOINT,
+            endpoint,
             params=params,
             headers=headers,
             timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT)
@@ -83,8 +102,8 @@ def get_weather_data():
         # Validate HTTP status code
         response.raise_for_status()
         
-        # Parse JSON response
-        weather_data = json.loads(response.text)
+        # Parse JSON straight from the response bytes (skips the str decode)
+        weather_data = json.loads(response.content)
         
         print("Data retrieved successfully!")
         return weather_data
@@ -114,6 +133,59 @@ def get_weather_data():
         print(f"❌ Unexpected error occurred: {e}")
         return None
 
+def get_weather_data_concurrently(locations, endpoint=API_ENDPOINT, max_workers=8):
+    """
+    Fetches weather data for several locations with parallel requests.
+    
+    Args:
+        locations (list): (latitude, longitude) pairs
+        endpoint (str): Forecast endpoint URL
+        max_workers (int): Maximum number of requests in flight
+        
+    Returns:
+        list: Weather data (or None on failure) per location, in input order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if not locations:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(locations))) as executor:
+        return list(executor.map(
+            lambda location: get_weather_data(endpoint, location[0], location[1]),
+            locations
+        ))
+
+def get_weather_data_batch(locations, endpoint=API_ENDPOINT):
+    """
+    Fetches weather data for several locations in a single request.
+    
+    Open-Meteo accepts comma-separated coordinate lists and answers with a
+    JSON array holding one forecast object per location.
+    
+    Args:
+        locations (list): (latitude, longitude) pairs
+        endpoint (str): Forecast endpoint URL
+        
+    Returns:
+        list: Weather data per location in input order, None if failed
+    """
+    if not locations:
+        return []
+    latitudes = ",".join(str(latitude) for latitude, _ in locations)
+    longitudes = ",".join(str(longitude) for _, longitude in locations)
+    
+    weather_data = get_weather_data(endpoint, latitudes, longitudes)
+    if weather_data is None:
+        return None
+    
+    # A single location comes back as a plain object
+    if isinstance(weather_data, dict):
+        weather_data = [weather_data]
+    if not isinstance(weather_data, list) or len(weather_data) != len(locations):
+        print(f"❌ Batch response error: expected {len(locations)} forecasts.")
+        return None
+    return weather_data
+
 def extract_weather_metrics(weather_data):
     """
     Extracts and formats weather metrics from API response.
@@ -177,6 +249,8 @@ def create_markdown_table(weather_metrics):
     Returns:
         str: Formatted Markdown table
     """
+    from tabulate import tabulate
+    
     try:
         # Prepare table data
         table_data = [
@@ -198,24 +272,104 @@ def create_markdown_table(weather_metrics):
         print(f"❌ Error creating markdown table: {e}")
         return None
 
-def main():
+def create_json_output(weather_metrics):
+    """
+    Creates a compact single-line JSON document from weather metrics.
+    
+    Args:
+        weather_metrics (dict): Weather data to format
+        
+    Returns:
+        str: JSON object with temperature, wind_speed and condition
+    """
+    return json.dumps(weather_metrics, separators=(",", ":"), ensure_ascii=False)
+
+def create_csv_output(weather_metrics):
+    """
+    Creates a two-line CSV (header plus values) from weather metrics.
+    
+    Args:
+        weather_metrics (dict): Weather data to format
+        
+    Returns:
+        str: CSV text without a trailing newline
+    """
+    import csv
+    import io
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["temperature", "wind_speed", "condition"])
+    writer.writerow([
+        weather_metrics['temperature'],
+        weather_metrics['wind_speed'],
+        weather_metrics['condition']
+    ])
+    return buffer.getvalue().rstrip("\n")
+
+def parse_args(argv=None):
+    """
+    Parses command line arguments.
+    
+    Args:
+        argv (list): Argument list (defaults to sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Fetch current weather for London.")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="markdown",
+        help="output format; json and csv print a single machine-readable record "
+             "and send progress messages to stderr (default: markdown)"
+    )
+    parser.add_argument(
+        "--endpoint",
+        default=API_ENDPOINT,
+        help="forecast endpoint URL (default: %(default)s)"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function that orchestrates the weather data fetching process.
     """
+    args = parse_args(argv)
+    machine_output = args.format != "markdown"
+    
     try:
-        # Step 1: Fetch weather data from API
-        weather_data = get_weather_data()
-        if weather_data is None:
-            print("❌ Failed to retrieve weather data. Exiting.")
-            sys.exit(1)
+        # Keep stdout clean for machine consumers: status and error
+        # messages go to stderr, only the final record goes to stdout.
+        if machine_output:
+            status_output = contextlib.redirect_stdout(sys.stderr)
+        else:
+            status_output = contextlib.nullcontext()
         
-        # Step 2: Extract and format weather metrics
-        weather_metrics = extract_weather_metrics(weather_data)
-        if weather_metrics is None:
-            print("❌ Failed to extract weather metrics. Exiting.")
-            sys.exit(1)
+        with status_output:
+            # Step 1: Fetch weather data from API
+            weather_data = get_weather_data(args.endpoint)
+            if weather_data is None:
+                print("❌ Failed to retrieve weather data. Exiting.")
+                sys.exit(1)
+            
+            # Step 2: Extract and format weather metrics
+            weather_metrics = extract_weather_metrics(weather_data)
+            if weather_metrics is None:
+                print("❌ Failed to extract weather metrics. Exiting.")
+                sys.exit(1)
+        
+        # Step 3: Render in the requested format and display it
+        if args.format == "json":
+            print(create_json_output(weather_metrics))
+            return
+        if args.format == "csv":
+            print(create_csv_output(weather_metrics))
+            return
         
-        # Step 3: Create and display Markdown table
         markdown_table = create_markdown_table(weather_metrics)
         if markdown_table is None:
             print("❌ Failed to create markdown table. Exiting.")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Weather Fetcher Load Test
+Drives weather_fetcher.py against the local Open-Meteo stub and reports
+throughput, latency percentiles and which error branch of
+get_weather_data each call ended in, for the single, concurrent and
+batched fetch modes. Every scenario is first run once (smoke run) and
+then under load; the script exits non-zero if any call ends in a branch
+other than the one the injected fault should produce.
+"""
+
+import argparse
+import contextlib
+import io
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+import weather_fetcher
+from weather_stub import ForecastStub
+
+FETCH_MODES = ("single", "concurrent", "batched")
+
+# Client read timeout used for the load test, well below the stub's stall
+LOADTEST_READ_TIMEOUT = 0.2  # seconds
+
+# Message prefixes printed by get_weather_data, mapped to outcome names
+OUTCOME_MARKERS = (
+    ("Network connection error", "connection_error"),
+    ("Timeout error", "timeout"),
+    ("HTTP error", "http_error"),
+    ("JSON parsing error", "json_error"),
+    ("Unexpected error", "unexpected_error"),
+    ("Batch response error", "batch_error")
+)
+
+# name -> (stub settings, expected outcome); "refused" runs with no server
+SCENARIOS = {
+    "healthy": ({}, "ok"),
+    "slow": ({"latency": 0.05}, "ok"),
+    "http_error": ({"fault": "http_error"}, "http_error"),
+    "rate_limit": ({"fault": "rate_limit"}, "http_error"),
+    "malformed": ({"fault": "malformed"}, "json_error"),
+    "timeout": ({"fault": "timeout"}, "timeout"),
+    "disconnect": ({"fault": "disconnect"}, "connection_error"),
+    "redirect_loop": ({"fault": "redirect_loop"}, "unexpected_error"),
+    "refused": (None, "connection_error"),
+    "flaky": ({"fault": "http_error", "fault_rate": 0.3}, None)
+}
+
+
+class ThreadOutputCapture(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that keeps a separate buffer per thread, so the
+    messages printed by concurrent get_weather_data calls can be attributed
+    to the call that produced them.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = io.StringIO()
+        return buffer.write(text)
+
+    def take(self):
+        """Returns and clears the calling thread's captured output."""
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer is not None else ""
+
+
+def classify(result, output):
+    """
+    Names the branch a fetch ended in.
+
+    Args:
+        result: Return value of the fetch
+        output (str): Messages the fetch printed
+
+    Returns:
+        str: Outcome name ("ok" or one of OUTCOME_MARKERS)
+    """
+    if result is not None:
+        return "ok"
+    for marker, outcome in OUTCOME_MARKERS:
+        if marker in output:
+            return outcome
+    return "unknown"
+
+
+def closed_port_url():
+    """Returns an endpoint URL on a localhost port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1/forecast"
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, int(round(fraction * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+@contextlib.contextmanager
+def timed_fetches(capture, record):
+    """
+    Temporarily wraps weather_fetcher.get_weather_data so that every call,
+    including the ones get_weather_data_concurrently and
+    get_weather_data_batch make internally, is timed and classified on the
+    thread that made it.
+
+    Args:
+        capture (ThreadOutputCapture): Installed stdout capture
+        record (callable): Called as record(duration, outcome) per request
+    """
+    original = weather_fetcher.get_weather_data
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        result = original(*args, **kwargs)
+        record(time.perf_counter() - start, classify(result, capture.take()))
+        return result
+
+    weather_fetcher.get_weather_data = timed
+    try:
+        yield
+    finally:
+        weather_fetcher.get_weather_data = original
+
+
+def run_mode(mode, endpoint, capture, calls, workers, batch_size):
+    """
+    Runs one fetch mode through the matching weather_fetcher function and
+    times every request.
+
+    Args:
+        mode (str): One of FETCH_MODES
+        endpoint (str): Forecast endpoint URL
+        capture (ThreadOutputCapture): Installed stdout capture
+        calls (int): Number of locations to fetch
+        workers (int): Parallel requests for the concurrent mode
+        batch_size (int): Locations per request for the batched mode
+
+    Returns:
+        tuple: (elapsed seconds, list of per-request latencies, Counter of outcomes)
+    """
+    locations = [(weather_fetcher.LATITUDE + i * 0.01, weather_fetcher.LONGITUDE) for i in range(calls)]
+    latencies = []
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def record(duration, outcome):
+        with lock:
+            latencies.append(duration)
+            outcomes[outcome] += 1
+
+    start = time.perf_counter()
+    if mode == "single":
+        with timed_fetches(capture, record):
+            for latitude, longitude in locations:
+                weather_fetcher.get_weather_data(endpoint, latitude, longitude)
+    elif mode == "concurrent":
+        with timed_fetches(capture, record):
+            weather_fetcher.get_weather_data_concurrently(locations, endpoint, max_workers=workers)
+    elif mode == "batched":
+        for offset in range(0, len(locations), batch_size):
+            batch = locations[offset:offset + batch_size]
+            batch_start = time.perf_counter()
+            result = weather_fetcher.get_weather_data_batch(batch, endpoint)
+            latencies.append(time.perf_counter() - batch_start)
+            # Batch-level outcome, so a bad array counts as batch_error
+            outcomes[classify(result, capture.take())] += len(batch)
+    else:
+        raise ValueError(f"Unknown fetch mode: {mode}")
+    return time.perf_counter() - start, latencies, outcomes
+
+
+def run_scenario(name, mode, calls, workers, batch_size, capture):
+    """
+    Runs one scenario in one mode against a fresh stub.
+
+    Returns:
+        dict: Report row for the scenario
+    """
+    settings, expected = SCENARIOS[name]
+    if settings is None:
+        elapsed, latencies, outcomes = run_mode(mode, closed_port_url(), capture, calls, workers, batch_size)
+    else:
+        with ForecastStub(seed=0, **settings) as stub:
+            elapsed, latencies, outcomes = run_mode(mode, stub.url, capture, calls, workers, batch_size)
+
+    ordered = sorted(latencies)
+    if expected is None:
+        passed = set(outcomes) <= {"ok", "http_error"}
+    else:
+        passed = set(outcomes) == {expected}
+    return {
+        "scenario": name,
+        "mode": mode,
+        "calls": calls,
+        "throughput": calls / elapsed if elapsed else float("inf"),
+        "p50": percentile(ordered, 0.50) * 1000,
+        "p90": percentile(ordered, 0.90) * 1000,
+        "p99": percentile(ordered, 0.99) * 1000,
+        "outcomes": outcomes,
+        "expected": expected or "ok/http_error",
+        "passed": passed
+    }
+
+
+def format_row(row):
+    """Formats one report row."""
+    outcomes = ", ".join(f"{outcome}={count}" for outcome, count in sorted(row["outcomes"].items()))
+    status = "PASS" if row["passed"] else "FAIL"
+    return (f"{status}  {row['scenario']:<14} {row['mode']:<10} {row['calls']:>5} calls "
+            f"{row['throughput']:9.1f}/s  p50 {row['p50']:8.2f} ms  p90 {row['p90']:8.2f} ms  "
+            f"p99 {row['p99']:8.2f} ms  [{outcomes}] expected {row['expected']}")
+
+
+def main(argv=None):
+    """
+    Runs the smoke and load phases and prints a report per scenario and mode.
+    """
+    parser = argparse.ArgumentParser(description="Load test weather_fetcher.py against the local stub.")
+    parser.add_argument("--calls", type=int, default=100, help="locations fetched per scenario and mode (default: 100)")
+    parser.add_argument("--workers", type=int, default=16, help="parallel requests in concurrent mode (default: 16)")
+    parser.add_argument("--batch-size", type=int, default=25, help="locations per batched request (default: 25)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--mode", action="append", choices=FETCH_MODES,
+                        help="fetch mode to run (repeatable, default: all)")
+    parser.add_argument("--skip-smoke", action="store_true", help="skip the one-call smoke run")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    modes = args.mode or list(FETCH_MODES)
+    phases = [("load", args.calls)]
+    if not args.skip_smoke:
+        phases.insert(0, ("smoke", 1))
+
+    # Keep timeout scenarios short; the stub stalls longer than this
+    original_read_timeout = weather_fetcher.READ_TIMEOUT
+    weather_fetcher.READ_TIMEOUT = LOADTEST_READ_TIMEOUT
+    capture = ThreadOutputCapture()
+    failures = 0
+    try:
+        for phase, calls in phases:
+            print(f"== {phase} run ({calls} call{'s' if calls != 1 else ''} per scenario and mode) ==")
+            for name in scenarios:
+                for mode in modes:
+                    with contextlib.redirect_stdout(capture):
+                        row = run_scenario(name, mode, calls, args.workers, args.batch_size, capture)
+                    print(format_row(row))
+                    failures += not row["passed"]
+            print()
+    finally:
+        weather_fetcher.READ_TIMEOUT = original_read_timeout
+
+    if failures:
+        print(f"❌ {failures} scenario run(s) ended in an unexpected branch.")
+        sys.exit(1)
+    print("✅ Every scenario ended in its expected branch.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Open-Meteo Stub Server
+Local, in-process stand-in for the Open-Meteo forecast endpoint used by
+weather_fetcher.py. It answers single and comma-separated (batched)
+coordinate requests and can inject latency and faults so the fetcher's
+error handling can be exercised without touching the real API.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FORECAST_PATH = "/v1/forecast"
+
+# Faults the stub can inject, with what the server does for each
+FAULTS = {
+    "http_error": "server answers 500 Internal Server Error",
+    "rate_limit": "server answers 429 Too Many Requests",
+    "malformed": "server answers 200 with a truncated JSON body",
+    "missing_fields": "server answers 200 without current_weather",
+    "timeout": "server stalls longer than the client read timeout",
+    "disconnect": "server closes the connection without answering",
+    "redirect_loop": "server redirects to itself forever"
+}
+
+# How long a "timeout" fault stalls before giving up on the client
+TIMEOUT_STALL = 2.0  # seconds
+
+
+def forecast_payload(latitude, longitude):
+    """
+    Builds a forecast object in the shape returned by the real endpoint.
+
+    Args:
+        latitude (float): Requested latitude
+        longitude (float): Requested longitude
+
+    Returns:
+        dict: Forecast with a current_weather block
+    """
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current_weather": {
+            "temperature": 14.3,
+            "windspeed": 11.6,
+            "winddirection": 240,
+            "weathercode": 3,
+            "time": "2024-01-01T12:00"
+        }
+    }
+
+
+class StubForecastHandler(BaseHTTPRequestHandler):
+    """Serves forecast requests according to the owning server's stub settings."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stub = self.server.stub
+        fault = stub.next_fault()
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        url = urlsplit(self.path)
+        if url.path != FORECAST_PATH:
+            self._send_json(404, b'{"error":true,"reason":"Not Found"}')
+            return
+
+        if fault == "http_error":
+            self._send_json(500, b'{"error":true,"reason":"Internal Server Error"}')
+        elif fault == "rate_limit":
+            self._send_json(429, b'{"error":true,"reason":"Too many requests"}')
+        elif fault == "malformed":
+            self._send_json(200, b'{"latitude": 51.5, "current_weather": {"temperature": ')
+        elif fault == "missing_fields":
+            self._send_json(200, b'{"latitude": 51.5, "longitude": -0.12}')
+        elif fault == "timeout":
+            # Outlast the client's read timeout, then drop the connection
+            time.sleep(TIMEOUT_STALL)
+            self.close_connection = True
+        elif fault == "disconnect":
+            self.close_connection = True
+        elif fault == "redirect_loop":
+            self.send_response(302)
+            self.send_header("Location", self.path)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(200, self._forecast_body(url.query))
+
+    def _forecast_body(self, query):
+        params = parse_qs(query)
+        latitudes = params.get("latitude", ["0"])[0].split(",")
+        longitudes = params.get("longitude", ["0"])[0].split(",")
+        forecasts = [
+            forecast_payload(float(latitude), float(longitude))
+            for latitude, longitude in zip(latitudes, longitudes)
+        ]
+        # Like Open-Meteo: one location is an object, several are an array
+        body = forecasts[0] if len(forecasts) == 1 else forecasts
+        return json.dumps(body).encode("utf-8")
+
+    def _send_json(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep test and benchmark output readable
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for load tests."""
+
+    daemon_threads = True
+    # The default backlog of 5 makes concurrent clients wait on SYN retries
+    request_queue_size = 128
+
+
+class ForecastStub:
+    """
+    Threaded local forecast server with configurable latency and faults.
+
+    Use as a context manager; `url` is the endpoint to hand to the fetcher.
+    Settings can be changed between requests with `configure`.
+    """
+
+    def __init__(self, latency=0.0, fault=None, fault_rate=1.0, seed=None):
+        self.latency = 0.0
+        self.fault = None
+        self.fault_rate = 1.0
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.configure(latency=latency, fault=fault, fault_rate=fault_rate)
+
+    def configure(self, latency=None, fault=None, fault_rate=None):
+        """
+        Updates stub behaviour; arguments left as None keep their value,
+        except `fault`, where None means healthy responses.
+
+        Args:
+            latency (float): Seconds to sleep before every response
+            fault (str): One of FAULTS, or None for healthy responses
+            fault_rate (float): Fraction of requests that get the fault
+        """
+        if fault is not None and fault not in FAULTS:
+            raise ValueError(f"Unknown fault: {fault}")
+        with self._lock:
+            if latency is not None:
+                self.latency = latency
+            if fault_rate is not None:
+                self.fault_rate = fault_rate
+            self.fault = fault
+
+    def next_fault(self):
+        """Counts a request and decides which fault (if any) it gets."""
+        with self._lock:
+            self.request_count += 1
+            if self.fault and self._random.random() < self.fault_rate:
+                return self.fault
+            return None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{FORECAST_PATH}"
+
+    def start(self):
+        """Starts serving on an ephemeral localhost port."""
+        self._server = StubHTTPServer(("127.0.0.1", 0), StubForecastHandler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and releases the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    """
+    Runs the stub in the foreground until interrupted.
+    """
+    parser = argparse.ArgumentParser(description="Local Open-Meteo forecast stub server.")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to delay each response")
+    parser.add_argument("--fault", choices=sorted(FAULTS), help="fault to inject")
+    parser.add_argument("--fault-rate", type=float, default=1.0, help="fraction of requests that fault")
+    args = parser.parse_args(argv)
+
+    with ForecastStub(latency=args.latency, fault=args.fault, fault_rate=args.fault_rate) as stub:
+        print(f"Stub forecast endpoint: {stub.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print("\nStopping stub server.")
+
+
+if __name__ == "__main__":
+    main()